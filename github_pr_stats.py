@@ -1,11 +1,24 @@
+import asyncio
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 import datetime
+import functools
 import sqlite3
 import json
+import math
 import os
-from collections import defaultdict
+import shlex
+import sys
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -21,13 +34,77 @@ if not GITHUB_TOKEN or not OWNER or not REPO:
 
 BASE_URL = "https://api.github.com"
 HEADERS = {"Authorization": f"token {GITHUB_TOKEN}"}
-DB_FILE = "github_pr_cache.db"
+# One cache file per repository: reports read every cached PR, so sharing a
+# file between repos would mix their PRs
+DB_FILE = f"github_pr_cache_{OWNER}_{REPO}.db"
+# Bounds for created_at range queries; GitHub timestamps are UTC ISO-8601,
+# which sort lexicographically in chronological order
+MIN_ISO_TIMESTAMP = "0000-01-01T00:00:00Z"
+MAX_ISO_TIMESTAMP = "9999-12-31T23:59:59Z"
+REVIEW_FETCH_CONCURRENCY = 10
+PR_SYNC_KEY = f"pull_requests_synced_through:{OWNER}/{REPO}"
+GHOST_USER = "ghost"  # GitHub's placeholder login for deleted accounts
+RATE_LIMIT_THRESHOLD = 50  # pause until reset once fewer requests than this remain
+RATE_LIMIT_MAX_RETRIES = 5
+SECONDARY_RATE_LIMIT_WAIT = 60  # seconds, when a 429 carries no Retry-After
+
+# Shared HTTP session so paginated requests reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+_conn = None
+
+
+def _get_conn():
+    """Return the shared SQLite connection, opening it on first use."""
+    global _conn
+    if _conn is None:
+        # Autocommit mode: writes manage their own BEGIN IMMEDIATE / COMMIT
+        _conn = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None)
+        for pragma in DB_PRAGMAS:
+            _conn.execute(pragma)
+    return _conn
+
+
+@contextmanager
+def _write_transaction():
+    """Run the enclosed writes in one BEGIN IMMEDIATE / COMMIT block."""
+    cursor = _get_conn().cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        yield cursor
+        # Inside the try so a failed COMMIT (e.g. SQLITE_BUSY) also rolls back,
+        # leaving the shared connection usable
+        cursor.execute("COMMIT")
+    except BaseException:
+        if _get_conn().in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+
+
+def _add_missing_column(cursor, table, column, column_type):
+    """Add a column to a table created by an older schema; return True if added."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column in [row[1] for row in cursor.fetchall()]:
+        return False
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    return True
 
 
 def init_database():
     """Initialize SQLite database with schema for caching PRs and reviews."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     # Table for pull requests
     cursor.execute("""
@@ -38,10 +115,14 @@ def init_database():
             created_at TEXT,
             updated_at TEXT,
             pr_data TEXT,
-            cached_at TEXT
+            cached_at TEXT,
+            last_reviews_updated_at TEXT
         )
     """)
     
+    # Databases created before last_reviews_updated_at existed need the column added
+    _add_missing_column(cursor, "pull_requests", "last_reviews_updated_at", "TEXT")
+    
     # Table for reviews
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS reviews (
@@ -49,84 +130,279 @@ def init_database():
             pr_number INTEGER,
             review_data TEXT,
             cached_at TEXT,
+            submitted_at TEXT,
+            reviewer TEXT,
             FOREIGN KEY (pr_number) REFERENCES pull_requests(pr_number)
         )
     """)
     
-    conn.commit()
-    conn.close()
+    # Backfill the normalized review columns on databases that predate them
+    added_submitted_at = _add_missing_column(cursor, "reviews", "submitted_at", "TEXT")
+    added_reviewer = _add_missing_column(cursor, "reviews", "reviewer", "TEXT")
+    if added_submitted_at or added_reviewer:
+        cursor.execute("""
+            UPDATE reviews SET
+                submitted_at = json_extract(review_data, '$.submitted_at'),
+                reviewer = COALESCE(json_extract(review_data, '$.user.login'), ?)
+        """, (GHOST_USER,))
+    
+    # Indices for the per-PR review lookup and the closed-PR scan
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reviews_pr ON reviews(pr_number)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pr_state ON pull_requests(state)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pr_created ON pull_requests(created_at)")
+    
+    # Table for conditional-request (ETag) caching of paginated API responses
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            body TEXT,
+            next_url TEXT,
+            cached_at TEXT
+        )
+    """)
+    
+    # Table for sync watermarks, written only once a sync pass has completed
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TEXT
+        )
+    """)
+
+
+def json_dumps(obj):
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
 
 
+def json_loads(data):
+    """Parse JSON from str or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=65536)
 def iso_to_dt(s):
-    return datetime.datetime.fromisoformat(s.replace("Z", "+00:00"))
+    # Memoized: the same PR created_at is re-parsed for each of its reviews
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    return datetime.datetime.fromisoformat(s)
 
 
-def fetch_all(url):
-    results = []
-    while url:
-        r = requests.get(url, headers=HEADERS)
+def utc_now_iso():
+    """Current UTC time as an ISO-8601 string, used for cached_at stamps."""
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def dt_to_iso(dt):
+    """Format an aware datetime like GitHub's timestamps, e.g. 2024-01-01T00:00:00Z."""
+    return dt.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def rate_limit_wait(r):
+    """
+    Inspect GitHub's rate-limit headers on a response.
+    
+    Returns a (retry, seconds) tuple: retry is True when the request was
+    rejected by a rate limit and should be repeated after sleeping, and
+    seconds is how long to sleep before the next request (0 for no pause).
+    Works with both requests and httpx responses.
+    """
+    remaining = r.headers.get("X-RateLimit-Remaining")
+    reset = r.headers.get("X-RateLimit-Reset")
+    until_reset = max(int(reset) - time.time(), 0) if reset else 0
+
+    if r.status_code in (403, 429):
+        retry_after = r.headers.get("Retry-After")
+        if retry_after:
+            return True, float(retry_after)
+        if remaining == "0":
+            return True, until_reset
+        if r.status_code == 429:
+            return True, SECONDARY_RATE_LIMIT_WAIT
+        # A plain 403 is a permissions problem, not a rate limit
+        return False, 0
+
+    if remaining is not None and int(remaining) < RATE_LIMIT_THRESHOLD:
+        return False, until_reset
+    return False, 0
+
+
+def get_with_backoff(url, headers=None):
+    """GET a URL through SESSION, sleeping and retrying when rate-limited."""
+    attempt = 0
+    while True:
+        r = SESSION.get(url, headers=headers)
+        retry, wait = rate_limit_wait(r)
+        if retry and attempt < RATE_LIMIT_MAX_RETRIES:
+            attempt += 1
+            print(f"  Rate limited, retrying in {wait:.0f}s...")
+            time.sleep(wait)
+            continue
+
         r.raise_for_status()
-        results.extend(r.json())
+        if wait:
+            print(f"  Rate limit nearly exhausted, pausing {wait:.0f}s until reset...")
+            time.sleep(wait)
+        return r
+
+
+async def get_with_backoff_async(client, url):
+    """Async counterpart of get_with_backoff for an httpx.AsyncClient."""
+    attempt = 0
+    while True:
+        r = await client.get(url)
+        retry, wait = rate_limit_wait(r)
+        if retry and attempt < RATE_LIMIT_MAX_RETRIES:
+            attempt += 1
+            print(f"  Rate limited, retrying in {wait:.0f}s...")
+            await asyncio.sleep(wait)
+            continue
+
+        r.raise_for_status()
+        if wait:
+            print(f"  Rate limit nearly exhausted, pausing {wait:.0f}s until reset...")
+            await asyncio.sleep(wait)
+        return r
+
+
+def iter_pages(url):
+    """Yield each page of a paginated API listing as a list, following Link headers."""
+    while url:
+        # Conditional request: a 304 means the cached page is still current
+        cached = get_http_cache(url)
+        headers = {"If-None-Match": cached["etag"]} if cached else None
+        r = get_with_backoff(url, headers)
+
+        if r.status_code == 304:
+            yield json_loads(cached["body"])
+            url = cached["next_url"]
+            continue
 
         # pagination
         if "next" in r.links:
-            url = r.links["next"]["url"]
+            next_url = r.links["next"]["url"]
         else:
-            url = None
+            next_url = None
 
-    return results
+        # Cache before yielding: a consumer that stops early never resumes us
+        etag = r.headers.get("ETag")
+        if etag:
+            save_http_cache(url, etag, r.text, next_url)
+
+        yield json_loads(r.content)
+
+        url = next_url
+
+
+def iter_all(url):
+    """Yield every item of a paginated API listing, one page in memory at a time."""
+    for page in iter_pages(url):
+        yield from page
 
 
-def save_pr_to_db(pr):
-    """Save a pull request to the database."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+def fetch_all(url):
+    return list(iter_all(url))
+
+
+def get_http_cache(url):
+    """Retrieve the cached ETag, body and next page URL for a request URL."""
+    cursor = _get_conn().cursor()
     
-    cursor.execute("""
-        INSERT OR REPLACE INTO pull_requests 
-        (pr_number, title, state, created_at, updated_at, pr_data, cached_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        pr["number"],
-        pr["title"],
-        pr["state"],
-        pr["created_at"],
-        pr["updated_at"],
-        json.dumps(pr),
-        datetime.datetime.now().isoformat()
-    ))
-    
-    conn.commit()
-    conn.close()
-
-
-def save_reviews_to_db(pr_number, reviews):
-    """Save reviews for a PR to the database."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    # Delete existing reviews for this PR
-    cursor.execute("DELETE FROM reviews WHERE pr_number = ?", (pr_number,))
-    
-    # Insert new reviews
-    for review in reviews:
+    cursor.execute(
+        "SELECT etag, body, next_url FROM http_cache WHERE url = ?",
+        (url,)
+    )
+    
+    row = cursor.fetchone()
+    
+    if row:
+        return {"etag": row[0], "body": row[1], "next_url": row[2]}
+    return None
+
+
+def save_http_cache(url, etag, body, next_url):
+    """Save a response body and its ETag for later conditional requests."""
+    with _write_transaction() as cursor:
         cursor.execute("""
-            INSERT INTO reviews (pr_number, review_data, cached_at)
-            VALUES (?, ?, ?)
+            INSERT OR REPLACE INTO http_cache (url, etag, body, next_url, cached_at)
+            VALUES (?, ?, ?, ?, ?)
         """, (
-            pr_number,
-            json.dumps(review),
-            datetime.datetime.now().isoformat()
+            url,
+            etag,
+            body,
+            next_url,
+            utc_now_iso()
         ))
+
+
+# Upsert rather than INSERT OR REPLACE so last_reviews_updated_at survives a PR refresh
+UPSERT_PR_SQL = """
+    INSERT INTO pull_requests 
+    (pr_number, title, state, created_at, updated_at, pr_data, cached_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(pr_number) DO UPDATE SET
+        title = excluded.title,
+        state = excluded.state,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        pr_data = excluded.pr_data,
+        cached_at = excluded.cached_at
+"""
+
+
+def save_prs_bulk(prs, cached_at=None):
+    """Save many pull requests to the database in a single transaction."""
+    cached_at = cached_at or utc_now_iso()
+    with _write_transaction() as cursor:
+        cursor.executemany(UPSERT_PR_SQL, [(
+            pr["number"],
+            pr["title"],
+            pr["state"],
+            pr["created_at"],
+            pr["updated_at"],
+            json_dumps(pr),
+            cached_at
+        ) for pr in prs])
+
+
+def save_reviews_to_db(pr_number, reviews, updated_at=None, cached_at=None):
+    """
+    Save reviews for a PR to the database.
     
-    conn.commit()
-    conn.close()
+    When updated_at is given, the PR's last_reviews_updated_at is set to it
+    in the same transaction, marking the reviews as current for that version.
+    Pass cached_at to share one timestamp across a batch of calls.
+    """
+    now_iso = cached_at or utc_now_iso()
+    with _write_transaction() as cursor:
+        if updated_at:
+            cursor.execute(
+                "UPDATE pull_requests SET last_reviews_updated_at = ? WHERE pr_number = ?",
+                (updated_at, pr_number)
+            )
+        
+        # Delete existing reviews for this PR
+        cursor.execute("DELETE FROM reviews WHERE pr_number = ?", (pr_number,))
+        
+        # Insert new reviews
+        cursor.executemany("""
+            INSERT INTO reviews (pr_number, review_data, cached_at, submitted_at, reviewer)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (pr_number, json_dumps(review), now_iso, *review_columns(review))
+            for review in reviews
+        ])
 
 
 def get_pr_from_db(pr_number):
     """Retrieve a PR from the database."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     cursor.execute(
         "SELECT pr_data FROM pull_requests WHERE pr_number = ?",
@@ -134,42 +410,124 @@ def get_pr_from_db(pr_number):
     )
     
     row = cursor.fetchone()
-    conn.close()
     
     if row:
-        return json.loads(row[0])
+        return json_loads(row[0])
     return None
 
 
-def get_reviews_from_db(pr_number):
-    """Retrieve reviews for a PR from the database."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+def review_columns(review):
+    """Extract the (submitted_at, reviewer) pair used for stats from a review."""
+    user = review.get("user") or {}
+    return review.get("submitted_at"), user.get("login") or GHOST_USER
+
+
+def get_latest_cached_update():
+    """Get the newest updated_at among cached PRs, or None if the cache is empty."""
+    cursor = _get_conn().cursor()
     
-    cursor.execute(
-        "SELECT review_data FROM reviews WHERE pr_number = ?",
-        (pr_number,)
-    )
+    cursor.execute("SELECT MAX(updated_at) FROM pull_requests")
+    
+    return cursor.fetchone()[0]
+
+
+def get_sync_state(key):
+    """Get a sync watermark, or None if no sync pass has completed yet."""
+    cursor = _get_conn().cursor()
+    
+    cursor.execute("SELECT value FROM sync_state WHERE key = ?", (key,))
+    
+    row = cursor.fetchone()
+    
+    if row:
+        return row[0]
+    return None
+
+
+def save_sync_state(key, value):
+    """Record a sync watermark after a sync pass has completed."""
+    with _write_transaction() as cursor:
+        cursor.execute("""
+            INSERT OR REPLACE INTO sync_state (key, value, updated_at)
+            VALUES (?, ?, ?)
+        """, (key, value, utc_now_iso()))
+
+
+def get_prs_created_between(from_iso=MIN_ISO_TIMESTAMP, to_iso=MAX_ISO_TIMESTAMP):
+    """Get cached PRs created within [from_iso, to_iso], newest first."""
+    cursor = _get_conn().cursor()
+    
+    cursor.execute("""
+        SELECT pr_data FROM pull_requests
+        WHERE created_at BETWEEN ? AND ?
+        ORDER BY created_at DESC, pr_number DESC
+    """, (from_iso, to_iso))
     
     rows = cursor.fetchall()
-    conn.close()
     
-    return [json.loads(row[0]) for row in rows]
+    return [json_loads(row[0]) for row in rows]
+
+
+def get_first_review_times(from_iso=MIN_ISO_TIMESTAMP, to_iso=MAX_ISO_TIMESTAMP):
+    """
+    Get (pr_number, title, created_at, first_review_at) for PRs created in range.
+    
+    The earliest submitted review is found with a single GROUP BY inside
+    SQLite; first_review_at is None for PRs without submitted reviews.
+    Rows are newest first, matching the API's default PR ordering.
+    """
+    cursor = _get_conn().cursor()
+    
+    cursor.execute("""
+        SELECT p.pr_number, p.title, p.created_at, MIN(r.submitted_at)
+        FROM pull_requests p
+        LEFT JOIN reviews r
+            ON r.pr_number = p.pr_number AND r.submitted_at IS NOT NULL
+        WHERE p.created_at BETWEEN ? AND ?
+        GROUP BY p.pr_number
+        ORDER BY p.created_at DESC, p.pr_number DESC
+    """, (from_iso, to_iso))
+    
+    return cursor.fetchall()
+
+
+def get_submitted_reviews(from_iso=MIN_ISO_TIMESTAMP, to_iso=MAX_ISO_TIMESTAMP):
+    """Get (reviewer, submitted_at, pr_created_at) for submitted reviews of PRs created in range."""
+    cursor = _get_conn().cursor()
+    
+    cursor.execute("""
+        SELECT r.reviewer, r.submitted_at, p.created_at
+        FROM reviews r
+        JOIN pull_requests p ON p.pr_number = r.pr_number
+        WHERE r.submitted_at IS NOT NULL AND p.created_at BETWEEN ? AND ?
+    """, (from_iso, to_iso))
+    
+    return cursor.fetchall()
+
+
+def get_reviews_synced_at():
+    """Map each cached PR number to the updated_at its reviews were fetched at."""
+    cursor = _get_conn().cursor()
+    
+    cursor.execute(
+        "SELECT pr_number, last_reviews_updated_at FROM pull_requests "
+        "WHERE last_reviews_updated_at IS NOT NULL"
+    )
+    
+    return dict(cursor.fetchall())
 
 
 def get_cached_closed_prs():
     """Get all closed PRs from the database."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     cursor.execute(
         "SELECT pr_data FROM pull_requests WHERE state = 'closed'"
     )
     
     rows = cursor.fetchall()
-    conn.close()
     
-    return [json.loads(row[0]) for row in rows]
+    return [json_loads(row[0]) for row in rows]
 
 
 def fetch_prs():
@@ -177,8 +535,105 @@ def fetch_prs():
     return fetch_all(f"{BASE_URL}/repos/{OWNER}/{REPO}/pulls?state=all&per_page=100")
 
 
-def fetch_reviews(pr_number):
-    return fetch_all(f"{BASE_URL}/repos/{OWNER}/{REPO}/pulls/{pr_number}/reviews")
+def sync_prs(cached_at=None):
+    """
+    Stream new and updated PRs from the API into the cache.
+    
+    PRs are requested most recently updated first, so paging stops at the
+    first PR older than the watermark left by the last completed sync:
+    everything after it is already cached. Without a watermark this is a
+    full backfill of every PR. Each page is saved as it arrives, so only one
+    page is held in memory and no write transaction stays open across a
+    network request.
+    
+    The watermark only advances once the pass finishes. If a sync fails
+    partway, the pages already saved hold only the newest PRs. The next run
+    then resumes from the old watermark instead of skipping the older PRs.
+    
+    Returns the number of PRs new or updated since the watermark; PRs tied
+    with it are re-saved in case of same-second updates but not counted.
+    """
+    latest_cached = get_sync_state(PR_SYNC_KEY)
+    url = f"{BASE_URL}/repos/{OWNER}/{REPO}/pulls?state=all&sort=updated&direction=desc&per_page=100"
+
+    if latest_cached:
+        print(f"Fetching pull requests updated since {latest_cached}...")
+    else:
+        print("Fetching all pull requests from API...")
+
+    count = 0
+    for page in iter_pages(url):
+        if latest_cached:
+            fresh = [pr for pr in page if pr["updated_at"] >= latest_cached]
+        else:
+            fresh = page
+        save_prs_bulk(fresh, cached_at)
+        if latest_cached:
+            count += sum(1 for pr in fresh if pr["updated_at"] > latest_cached)
+        else:
+            count += len(fresh)
+        if len(fresh) < len(page):
+            break
+
+    # Every PR updated since the old watermark is cached now
+    latest_update = get_latest_cached_update()
+    if latest_update:
+        save_sync_state(PR_SYNC_KEY, latest_update)
+
+    return count
+
+
+async def fetch_reviews_async(client, pr_number):
+    """Fetch all review pages for a PR using the shared async client."""
+    url = f"{BASE_URL}/repos/{OWNER}/{REPO}/pulls/{pr_number}/reviews"
+    results = []
+    while url:
+        r = await get_with_backoff_async(client, url)
+        results.extend(json_loads(r.content))
+
+        # pagination
+        if "next" in r.links:
+            url = r.links["next"]["url"]
+        else:
+            url = None
+
+    return results
+
+
+async def gather_with_limit(pr_numbers, on_fetched=None, limit=REVIEW_FETCH_CONCURRENCY):
+    """
+    Fetch reviews for many PRs concurrently, at most `limit` at a time.
+    
+    on_fetched(pr_number, reviews) is called as soon as each PR's reviews
+    arrive, so they can be cached even if a later fetch fails. Every fetch
+    runs to completion before the first failure, if any, is re-raised.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        # Renamed or transferred repos answer with 301s, which requests follows
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    ) as client:
+        async def fetch(pr_number):
+            async with semaphore:
+                reviews = await fetch_reviews_async(client, pr_number)
+            if on_fetched:
+                on_fetched(pr_number, reviews)
+            return reviews
+
+        results = await asyncio.gather(
+            *(fetch(pr_number) for pr_number in pr_numbers),
+            return_exceptions=True
+        )
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+    return dict(zip(pr_numbers, results))
 
 
 def get_stats(from_date=None, to_date=None):
@@ -217,77 +672,67 @@ def get_stats(from_date=None, to_date=None):
     else:
         print("\n=== No date filter applied ===")
     
-    # Fetch ALL PRs from API (both open and closed)
-    print("Fetching all pull requests from API...")
-    all_prs = fetch_all(f"{BASE_URL}/repos/{OWNER}/{REPO}/pulls?state=all&per_page=100")
+    # Sync new and updated PRs (both open and closed) into the cache;
+    # one timestamp covers every row written by this run
+    now_iso = utc_now_iso()
+    synced_count = sync_prs(now_iso)
     
-    print(f"Found {len(all_prs)} total PRs")
+    print(f"Found {synced_count} new or updated PRs")
     
-    # Cache all PRs
-    for pr in all_prs:
-        save_pr_to_db(pr)
+    # Apply date filtering as an indexed range scan over the cached PRs
+    from_iso = dt_to_iso(from_dt) if from_dt else MIN_ISO_TIMESTAMP
+    to_iso = dt_to_iso(to_dt) if to_dt else MAX_ISO_TIMESTAMP
+    all_prs = get_prs_created_between(from_iso, to_iso)
     
-    # Apply date filtering
     if from_dt or to_dt:
-        filtered_prs = []
-        for pr in all_prs:
-            created_at = iso_to_dt(pr["created_at"])
-            
-            if from_dt and created_at < from_dt:
-                continue
-            if to_dt and created_at > to_dt:
-                continue
-            
-            filtered_prs.append(pr)
-        
-        print(f"After date filtering: {len(filtered_prs)} PRs")
-        all_prs = filtered_prs
+        print(f"After date filtering: {len(all_prs)} PRs")
+    else:
+        print(f"Found {len(all_prs)} total PRs")
     
-    reviewer_metrics = defaultdict(list)
-    pr_metrics = []
+    # Resolve reviews from the cache where possible, collect the rest to fetch
+    reviews_synced_at = get_reviews_synced_at()
+    to_fetch = {}
 
     for pr in all_prs:
         pr_number = pr["number"]
-        created_at = iso_to_dt(pr["created_at"])
-        updated_at = iso_to_dt(pr["updated_at"])
         title = pr["title"]
         state = pr["state"]
 
         print(f"Processing PR #{pr_number}: {title} [{state}]")
 
-        # For closed PRs, try to use cached reviews first
+        # A closed PR not updated since its reviews were cached cannot have new ones
         if state == "closed":
-            reviews = get_reviews_from_db(pr_number)
-            if reviews:
+            synced_at = reviews_synced_at.get(pr_number)
+            if synced_at and pr["updated_at"] <= synced_at:
                 print(f"  Using cached reviews for closed PR #{pr_number}")
+                continue
+            if synced_at:
+                print(f"  Fetching reviews for closed PR #{pr_number} (updated since reviews were cached)")
             else:
                 print(f"  Fetching reviews for closed PR #{pr_number} (not in cache)")
-                reviews = fetch_reviews(pr_number)
-                save_reviews_to_db(pr_number, reviews)
         else:
             # For open PRs, always fetch fresh reviews
             print(f"  Fetching fresh reviews for open PR #{pr_number}")
-            reviews = fetch_reviews(pr_number)
-            save_reviews_to_db(pr_number, reviews)
-
-        if not reviews:
-            pr_metrics.append({
-                "pr_number": pr_number,
-                "title": title,
-                "created_at": created_at,
-                "first_review_at": None,
-                "time_to_first_review_hours": None
-            })
-            continue
+        to_fetch[pr_number] = pr["updated_at"]
+
+    if to_fetch:
+        print(f"Fetching reviews for {len(to_fetch)} PRs...")
+        # Cache each PR's reviews as they arrive so a failed run keeps its progress
+        asyncio.run(gather_with_limit(
+            list(to_fetch),
+            lambda pr_number, reviews: save_reviews_to_db(
+                pr_number, reviews, to_fetch[pr_number], now_iso
+            )
+        ))
 
-        # Sort reviews by submission time
-        reviews_sorted = sorted(reviews, key=lambda r: r.get("submitted_at") or "")
+    # Every review is cached now, so aggregate straight from the database
+    pr_metrics = []
 
-        # First review time
-        first_review = next((r for r in reviews_sorted if r.get("submitted_at")), None)
+    for pr_number, title, created, first_submitted_at in get_first_review_times(from_iso, to_iso):
+        created_at = iso_to_dt(created)
 
-        if first_review:
-            first_review_at = iso_to_dt(first_review["submitted_at"])
+        if first_submitted_at:
+            first_review_at = iso_to_dt(first_submitted_at)
             delta = first_review_at - created_at
             hours = delta.total_seconds() / 3600
         else:
@@ -303,40 +748,82 @@ def get_stats(from_date=None, to_date=None):
             "time_to_first_review_hours": hours
         })
 
-        # Per-reviewer metrics
-        for r in reviews_sorted:
-            if not r.get("submitted_at"):
-                continue
+    # Per-reviewer metrics as running (sum, fastest, slowest, count) aggregates
+    reviewer_metrics = {}
 
-            reviewer = r["user"]["login"]
-            submitted = iso_to_dt(r["submitted_at"])
-            reviewer_delta = submitted - created_at
+    for reviewer, submitted_at, created in get_submitted_reviews(from_iso, to_iso):
+        reviewer_delta = iso_to_dt(submitted_at) - iso_to_dt(created)
+        hours = reviewer_delta.total_seconds() / 3600
 
-            reviewer_metrics[reviewer].append(reviewer_delta.total_seconds() / 3600)
+        total, fastest, slowest, count = reviewer_metrics.get(reviewer, (0.0, math.inf, -math.inf, 0))
+        reviewer_metrics[reviewer] = (
+            total + hours,
+            min(fastest, hours),
+            max(slowest, hours),
+            count + 1
+        )
 
     # -------------------------
     # Print results
     # -------------------------
 
-    print("\n=== PR Review Times ===")
+    # Collect the report and write it in one call rather than one print per line
+    out = ["", "=== PR Review Times ==="]
     for pr in pr_metrics:
-        print(f"PR #{pr['pr_number']}: {pr['title']}")
-        print(f"  Created: {pr['created_at']}")
-        print(f"  First review: {pr['first_review_at']}")
-        print(f"  Time to first review (hours): {pr['time_to_first_review_hours']}")
-        print()
-
-    print("\n=== Reviewer Statistics ===")
-    for reviewer, times in sorted(reviewer_metrics.items()):
-        avg = sum(times) / len(times)
-        fastest = min(times)
-        slowest = max(times)
-        print(f"{reviewer}:")
-        print(f"  Average: {avg:.2f} hours")
-        print(f"  Fastest: {fastest:.2f} hours")
-        print(f"  Slowest: {slowest:.2f} hours")
-        print(f"  Total reviews: {len(times)}")
-        print()
+        out.append(f"PR #{pr['pr_number']}: {pr['title']}")
+        out.append(f"  Created: {pr['created_at']}")
+        out.append(f"  First review: {pr['first_review_at']}")
+        out.append(f"  Time to first review (hours): {pr['time_to_first_review_hours']}")
+        out.append("")
+
+    out.append("")
+    out.append("=== Reviewer Statistics ===")
+    for reviewer, (total, fastest, slowest, count) in sorted(reviewer_metrics.items()):
+        avg = total / count
+        out.append(f"{reviewer}:")
+        out.append(f"  Average: {avg:.2f} hours")
+        out.append(f"  Fastest: {fastest:.2f} hours")
+        out.append(f"  Slowest: {slowest:.2f} hours")
+        out.append(f"  Total reviews: {count}")
+        out.append("")
+
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+# -----------------------
+# Interactive mode text
+# -----------------------
+COMMANDS_TEXT = """Available commands:
+  get_stats()                      - Get all PR statistics
+  get_stats(from_date)             - From date to now
+  get_stats(from_date, to_date)    - Date range filter"""
+
+BANNER_TEXT = f"""{"=" * 60}
+GitHub PR Statistics - Interactive Mode
+{"=" * 60}
+
+{COMMANDS_TEXT}
+
+Date format: YYYY-MM-DD (e.g., 2024-01-01)
+Type 'exit' or 'quit' to stop
+
+{"=" * 60}"""
+
+HELP_TEXT = f"""
+{COMMANDS_TEXT}
+
+Examples:
+  get_stats()
+  get_stats(2024-01-01)
+  get_stats(2024-01-01, 2024-12-31)"""
+
+AVAILABLE_METHODS_TEXT = """Available methods:
+  - get_stats(): Get all PR statistics
+  - get_stats(from_date): Get PR statistics from date to now
+  - get_stats(from_date, to_date): Get PR statistics in date range"""
+
+EXIT_COMMANDS = frozenset({"exit", "quit", "q"})
+HELP_COMMANDS = frozenset({"help", "?"})
 
 
 def parse_and_execute(command):
@@ -357,10 +844,17 @@ def parse_and_execute(command):
     # Parse arguments
     args = []
     if args_str:
-        # Split by comma, but be careful with quoted strings
-        import re
-        # Simple argument parser - handles quoted strings and bare values
-        args = [arg.strip().strip('"').strip("'") for arg in re.split(r',\s*(?=(?:[^"]*"[^"]*")*[^"]*$)', args_str) if arg.strip()]
+        # Split on commas outside quotes; posix mode drops the quotes themselves
+        # and handles escapes, so both bare and quoted values work
+        lexer = shlex.shlex(args_str, posix=True)
+        lexer.whitespace = ","
+        lexer.whitespace_split = True
+        lexer.commenters = ""  # '#' is an ordinary character, not a comment
+        try:
+            args = [arg.strip() for arg in lexer if arg.strip()]
+        except ValueError as e:
+            print(f"Error: Could not parse arguments: {e}")
+            return
     
     # Execute the method
     if method_name == 'get_stats':
@@ -374,26 +868,14 @@ def parse_and_execute(command):
             print(f"Error: get_stats accepts 0, 1, or 2 arguments, got {len(args)}")
     else:
         print(f"Error: Unknown method '{method_name}'")
-        print("Available methods:")
-        print("  - get_stats(): Get all PR statistics")
-        print("  - get_stats(from_date): Get PR statistics from date to now")
-        print("  - get_stats(from_date, to_date): Get PR statistics in date range")
+        print(AVAILABLE_METHODS_TEXT)
 
 
 def main():
     """
     Main interactive loop - keeps process alive and waits for commands.
     """
-    print("="*60)
-    print("GitHub PR Statistics - Interactive Mode")
-    print("="*60)
-    print("\nAvailable commands:")
-    print("  get_stats()                      - Get all PR statistics")
-    print("  get_stats(from_date)             - From date to now")
-    print("  get_stats(from_date, to_date)    - Date range filter")
-    print("\nDate format: YYYY-MM-DD (e.g., 2024-01-01)")
-    print("Type 'exit' or 'quit' to stop\n")
-    print("="*60)
+    print(BANNER_TEXT)
     
     while True:
         try:
@@ -402,19 +884,12 @@ def main():
             if not command:
                 continue
             
-            if command.lower() in ['exit', 'quit', 'q']:
+            if command.lower() in EXIT_COMMANDS:
                 print("Goodbye!")
                 break
             
-            if command.lower() in ['help', '?']:
-                print("\nAvailable commands:")
-                print("  get_stats()                      - Get all PR statistics")
-                print("  get_stats(from_date)             - From date to now")
-                print("  get_stats(from_date, to_date)    - Date range filter")
-                print("\nExamples:")
-                print("  get_stats()")
-                print("  get_stats(2024-01-01)")
-                print("  get_stats(2024-01-01, 2024-12-31)")
+            if command.lower() in HELP_COMMANDS:
+                print(HELP_TEXT)
                 continue
             
             parse_and_execute(command)